@@ -1,10 +1,18 @@
 import os
+import time
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from flask import Flask, render_template, redirect, url_for, flash, request
+from functools import wraps
+from flask import Flask, render_template, redirect, url_for, flash, request, session as flask_session
+from markupsafe import Markup
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user, UserMixin
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import event, func, or_
+from sqlalchemy.orm import DeclarativeBase, joinedload
+from sqlalchemy.sql import Select
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.middleware.proxy_fix import ProxyFix
 
@@ -15,6 +23,19 @@ logging.basicConfig(level=logging.DEBUG)
 class Base(DeclarativeBase):
     pass
 
+# Session that can send read-only queries to the replica bind
+class RoutingSession(FlaskSQLAlchemySession):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        # Views opt in with @read_replica; only SELECTs go to the replica, and
+        # pending or flushed changes keep the session on the primary
+        if (bind is None and isinstance(clause, Select) and self.info.get('use_replica')
+                and not self.info.get('pinned_to_primary')
+                and not (self.new or self.dirty or self.deleted)):
+            replica = self._db.engines.get('replica')
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
 # Initialize Flask app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "default_secret_key_for_development")
@@ -28,8 +49,17 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_pre_ping": True,
 }
 
+# Optional read replica for admin analytics and reports
+if os.environ.get("DATABASE_REPLICA_URL"):
+    app.config["SQLALCHEMY_BINDS"] = {"replica": os.environ.get("DATABASE_REPLICA_URL")}
+app.config["REPLICA_PIN_SECONDS"] = int(os.environ.get("REPLICA_PIN_SECONDS", 10))
+
+# Admin employee listing
+app.config["EMPLOYEES_PER_PAGE"] = int(os.environ.get("EMPLOYEES_PER_PAGE", 50))
+app.config["EMPLOYEE_ROW_CACHE_SIZE"] = int(os.environ.get("EMPLOYEE_ROW_CACHE_SIZE", 20000))
+
 # Initialize SQLAlchemy
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
 db.init_app(app)
 
 # Initialize LoginManager
@@ -98,6 +128,53 @@ class Report(db.Model):
 def load_user(user_id):
     return User.query.get(int(user_id))
 
+def _now():
+    return time.time()
+
+@event.listens_for(RoutingSession, 'after_flush')
+def pin_session_to_primary(session, flush_context):
+    session.info['pinned_to_primary'] = True
+
+@app.after_request
+def pin_writer_to_primary(response):
+    # Keep admins who just wrote on the primary for a while so the replica-routed
+    # admin views show their own writes despite replica lag
+    if ('replica' in db.engines and db.session.info.get('pinned_to_primary')
+            and getattr(current_user, 'is_admin', False)):
+        flask_session['db_primary_until'] = _now() + app.config["REPLICA_PIN_SECONDS"]
+    return response
+
+# Rendered employee table rows, keyed by user id -> (row data, html), least recently used first
+employee_row_cache = OrderedDict()
+employee_row_cache_lock = threading.Lock()
+
+def render_employee_row(employee, role_name, break_count):
+    # Comparing row data invalidates rows changed by any worker, including bulk deletes
+    row_data = (employee.username, employee.email, role_name, break_count, employee.created_at)
+    with employee_row_cache_lock:
+        cached = employee_row_cache.get(employee.id)
+        if cached and cached[0] == row_data:
+            employee_row_cache.move_to_end(employee.id)
+            return cached[1]
+    
+    html = Markup(render_template('admin/employee_row.html', employee=employee,
+                                  role_name=role_name, break_count=break_count))
+    with employee_row_cache_lock:
+        employee_row_cache[employee.id] = (row_data, html)
+        employee_row_cache.move_to_end(employee.id)
+        while len(employee_row_cache) > app.config["EMPLOYEE_ROW_CACHE_SIZE"]:
+            employee_row_cache.popitem(last=False)
+    return html
+
+def read_replica(view):
+    """Route the view's queries to the replica unless this user wrote recently."""
+    @wraps(view)
+    def decorated_view(*args, **kwargs):
+        if flask_session.get('db_primary_until', 0) < _now():
+            db.session.info['use_replica'] = True
+        return view(*args, **kwargs)
+    return decorated_view
+
 # Initialize database and default data
 # In newer Flask versions, before_first_request is removed, so we'll use an initialization function
 def initialize_database():
@@ -304,7 +381,9 @@ def edit_employee(employee_id):
         flash('Employee updated successfully')
         return redirect(url_for('admin_employees'))
     
-    return render_template('admin/edit_employee.html', employee=employee, Break=Break)
+    recent_breaks = employee.breaks.order_by(Break.start_time.desc()).limit(5).all()
+    
+    return render_template('admin/edit_employee.html', employee=employee, recent_breaks=recent_breaks)
 
 @app.route('/admin/employee/<int:employee_id>/delete', methods=['POST'])
 @login_required
@@ -334,6 +413,7 @@ def delete_employee(employee_id):
 # Admin routes
 @app.route('/admin')
 @login_required
+@read_replica
 def admin_dashboard():
     if not current_user.is_admin:
         flash('You do not have permission to access the admin dashboard')
@@ -371,10 +451,36 @@ def admin_employees():
         flash('You do not have permission to access this page')
         return redirect(url_for('dashboard'))
     
-    # Get all employees (non-admin users)
-    employees = User.query.filter_by(is_admin=False).all()
+    page = request.args.get('page', 1, type=int)
+    search = request.args.get('q', '').strip()
+    
+    # Page through employees (non-admin users) with their role joined in
+    query = User.query.options(joinedload(User.role)).filter(User.is_admin.is_(False))
+    
+    if search:
+        # Match the search text literally rather than as LIKE wildcards
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        pattern = f'%{escaped}%'
+        query = query.filter(or_(User.username.ilike(pattern, escape='\\'),
+                                 User.email.ilike(pattern, escape='\\')))
+    
+    pagination = query.order_by(User.id) \
+        .paginate(page=page, per_page=app.config["EMPLOYEES_PER_PAGE"], error_out=False)
+    
+    # Break counts for this page only, in one grouped query
+    page_ids = [employee.id for employee in pagination.items]
+    break_counts = dict(
+        db.session.query(Break.user_id, func.count(Break.id))
+        .filter(Break.user_id.in_(page_ids))
+        .group_by(Break.user_id)
+        .all()
+    ) if page_ids else {}
+    
+    rows = [render_employee_row(employee, employee.role.name if employee.role else None,
+                                break_counts.get(employee.id, 0))
+            for employee in pagination.items]
     
-    return render_template('admin/employees.html', employees=employees)
+    return render_template('admin/employees.html', rows=rows, pagination=pagination, search=search)
 
 @app.route('/admin/reports', methods=['GET', 'POST'])
 @login_required
@@ -424,6 +530,7 @@ def admin_reports():
 
 @app.route('/admin/breaks')
 @login_required
+@read_replica
 def admin_breaks():
     if not current_user.is_admin:
         flash('You do not have permission to access this page')
@@ -458,6 +565,7 @@ def admin_breaks():
 
 @app.route('/admin/report/<int:report_id>')
 @login_required
+@read_replica
 def view_report(report_id):
     if not current_user.is_admin:
         flash('You do not have permission to access this page')
@@ -0,0 +1,25 @@
+import os
+import tempfile
+
+import pytest
+from jinja2 import ChoiceLoader, FileSystemLoader, PrefixLoader
+
+# Two local SQLite databases stand in for the primary and its replica; app.py
+# reads these at import time, so they must be set before it is imported
+DB_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'primary.db')}"
+os.environ["DATABASE_REPLICA_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'replica.db')}"
+
+from app import app  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='session', autouse=True)
+def flat_templates():
+    app.config["TESTING"] = True
+    # Templates are checked in flat; serve them under the admin/ prefix the views use
+    app.jinja_loader = ChoiceLoader([
+        PrefixLoader({'admin': FileSystemLoader(REPO_ROOT)}),
+        FileSystemLoader(REPO_ROOT),
+    ])
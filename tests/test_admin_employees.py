@@ -0,0 +1,127 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+import app as app_module
+from app import app, db, Break, Role, User
+
+
+@pytest.fixture(scope='module', autouse=True)
+def employees():
+    with app.app_context():
+        employee_role = Role.query.filter_by(name='employee').first()
+        for username, break_count in (('listing_a_b', 2), ('listingXaYb', 0), ('listing%c', 1)):
+            employee = User()
+            employee.username = username
+            employee.email = f'{username.replace("%", "pct")}@example.com'
+            employee.role_id = employee_role.id
+            db.session.add(employee)
+            db.session.flush()
+            for _ in range(break_count):
+                break_item = Break()
+                break_item.user_id = employee.id
+                break_item.start_time = datetime.now()
+                db.session.add(break_item)
+        db.session.commit()
+    yield
+    with app.app_context():
+        Break.query.delete()
+        User.query.filter_by(is_admin=False).delete()
+        db.session.commit()
+
+
+def admin_client():
+    client = app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+    return client
+
+
+@contextmanager
+def recorded_statements():
+    statements = []
+    with app.app_context():
+        engine = db.engines[None]
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def test_search_matches_wildcards_literally():
+    client = admin_client()
+    
+    body = client.get('/admin/employees', query_string={'q': 'listing_a'}).get_data(as_text=True)
+    assert 'listing_a_b' in body
+    assert 'listingXaYb' not in body
+    
+    body = client.get('/admin/employees', query_string={'q': '%'}).get_data(as_text=True)
+    assert 'listing%c' in body
+    assert 'listing_a_b' not in body
+
+
+def test_rows_show_role_and_break_count():
+    client = admin_client()
+    
+    body = client.get('/admin/employees', query_string={'q': 'listing_a_b'}).get_data(as_text=True)
+    assert 'Employee</span>' in body
+    assert '<td>2</td>' in body
+
+
+def test_break_counts_are_limited_to_the_page():
+    client = admin_client()
+    
+    with recorded_statements() as statements:
+        response = client.get('/admin/employees')
+    assert response.status_code == 200
+    
+    # Only the page's grouped count touches breaks; the pagination count does not
+    break_statements = [s for s in statements if 'breaks' in s]
+    assert len(break_statements) == 1
+    assert ' IN ' in break_statements[0]
+    # Roles come in with the page query instead of a lazy load per row
+    assert not [s for s in statements if s.startswith('SELECT roles.')]
+
+
+def test_rows_rerender_when_breaks_change():
+    client = admin_client()
+    query = {'q': 'listingXaYb'}
+    
+    assert '<td>0</td>' in client.get('/admin/employees', query_string=query).get_data(as_text=True)
+    
+    with app.app_context():
+        employee = User.query.filter_by(username='listingXaYb').first()
+        break_item = Break()
+        break_item.user_id = employee.id
+        break_item.start_time = datetime.now()
+        db.session.add(break_item)
+        db.session.commit()
+    
+    assert '<td>1</td>' in client.get('/admin/employees', query_string=query).get_data(as_text=True)
+
+
+def test_row_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setitem(app.config, "EMPLOYEE_ROW_CACHE_SIZE", 2)
+    monkeypatch.setattr(app_module, 'employee_row_cache', type(app_module.employee_row_cache)())
+    cache = app_module.employee_row_cache
+    
+    with app.test_request_context():
+        a, b, c = (User.query.filter_by(username=username).first()
+                   for username in ('listing_a_b', 'listingXaYb', 'listing%c'))
+        
+        first_a = app_module.render_employee_row(a, 'employee', 0)
+        app_module.render_employee_row(b, 'employee', 0)
+        assert list(cache) == [a.id, b.id]
+        
+        # A hit returns the cached fragment and marks it most recently used
+        assert app_module.render_employee_row(a, 'employee', 0) is first_a
+        assert list(cache) == [b.id, a.id]
+        
+        app_module.render_employee_row(c, 'employee', 0)
+        assert list(cache) == [a.id, c.id]
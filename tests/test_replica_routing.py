@@ -0,0 +1,179 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from flask import template_rendered
+from sqlalchemy import event, func, insert, select
+from werkzeug.security import generate_password_hash
+
+import app as app_module
+from app import app, db, Break, Report, Role, User
+
+REPLICA_BREAKS = 3
+PRIMARY_BREAKS = 1
+
+
+@pytest.fixture(scope='module', autouse=True)
+def seeded():
+    with app.app_context():
+        employee_role = Role.query.filter_by(name='employee').first()
+        employee = User()
+        employee.username = 'employee'
+        employee.email = 'employee@example.com'
+        employee.password_hash = generate_password_hash('employee123')
+        employee.role_id = employee_role.id
+        db.session.add(employee)
+        db.session.commit()
+        
+        # The replica gets the same users but different breaks and a report the primary lacks
+        replica = db.engines['replica']
+        db.metadata.create_all(replica)
+        with replica.begin() as conn:
+            for model in (Role, User):
+                rows = db.session.execute(select(model.__table__)).mappings().all()
+                conn.execute(insert(model.__table__), [dict(row) for row in rows])
+        
+        now = datetime.now()
+        with replica.begin() as conn:
+            conn.execute(insert(Break.__table__), [
+                {'user_id': employee.id, 'start_time': now - timedelta(minutes=i), 'duration': 600}
+                for i in range(REPLICA_BREAKS)
+            ])
+            conn.execute(insert(Report.__table__), {
+                'id': 1, 'name': 'Replica report', 'report_type': 'team',
+                'start_date': now - timedelta(days=1), 'end_date': now + timedelta(days=1),
+                'created_at': now,
+            })
+        
+        for i in range(PRIMARY_BREAKS):
+            break_item = Break()
+            break_item.user_id = employee.id
+            break_item.start_time = now - timedelta(minutes=i)
+            break_item.duration = 60
+            db.session.add(break_item)
+        db.session.commit()
+    yield
+    with app.app_context():
+        Break.query.delete()
+        User.query.filter_by(is_admin=False).delete()
+        db.session.commit()
+        db.metadata.drop_all(db.engines['replica'])
+
+
+def login(username, password):
+    client = app.test_client()
+    client.post('/login', data={'username': username, 'password': password})
+    return client
+
+
+def primary_break_count():
+    with app.app_context():
+        return db.session.execute(select(func.count(Break.id))).scalar()
+
+
+@contextmanager
+def captured_context():
+    contexts = []
+    
+    def record(sender, template, context, **extra):
+        contexts.append(context)
+    
+    template_rendered.connect(record, app)
+    try:
+        yield contexts
+    finally:
+        template_rendered.disconnect(record, app)
+
+
+def render(client, url):
+    with captured_context() as contexts:
+        response = client.get(url)
+    assert response.status_code == 200
+    return contexts[0]
+
+
+@contextmanager
+def counted_statements(bind_key):
+    counts = {'statements': 0}
+    with app.app_context():
+        engine = db.engines[bind_key]
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counts['statements'] += 1
+    
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        yield counts
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+
+
+def test_decorated_views_read_from_replica():
+    client = login('admin', 'admin123')
+    
+    assert render(client, '/admin')['total_breaks'] == REPLICA_BREAKS
+    assert len(render(client, '/admin/breaks')['breaks']) == REPLICA_BREAKS
+    
+    statistics = render(client, '/admin/report/1')['statistics']
+    assert statistics[0]['total_breaks'] == REPLICA_BREAKS
+
+
+def test_undecorated_views_read_from_primary():
+    client = login('admin', 'admin123')
+    
+    assert render(client, '/admin/reports')['reports'] == []
+
+
+def test_admin_write_pins_client_to_primary(monkeypatch):
+    client = login('admin', 'admin123')
+    response = client.post('/api/breaks', json={'start_time': datetime.now().isoformat()})
+    assert response.status_code == 200
+    
+    assert render(client, '/admin')['total_breaks'] == primary_break_count()
+    
+    pinned_until = time.time() + app.config["REPLICA_PIN_SECONDS"]
+    monkeypatch.setattr(app_module, '_now', lambda: pinned_until + 1)
+    assert render(client, '/admin')['total_breaks'] == REPLICA_BREAKS
+
+
+def test_employee_write_does_not_pin():
+    client = login('employee', 'employee123')
+    response = client.post('/api/breaks', json={'start_time': datetime.now().isoformat()})
+    assert response.status_code == 200
+    
+    with client.session_transaction() as sess:
+        assert 'db_primary_until' not in sess
+
+
+def test_falls_back_to_primary_without_replica(monkeypatch):
+    with app.app_context():
+        monkeypatch.delitem(db.engines, 'replica')
+    client = login('admin', 'admin123')
+    
+    assert render(client, '/admin')['total_breaks'] == primary_break_count()
+    
+    client.post('/api/breaks', json={'start_time': datetime.now().isoformat()})
+    with client.session_transaction() as sess:
+        assert 'db_primary_until' not in sess
+
+
+def test_replica_relieves_primary(monkeypatch):
+    urls = ['/admin', '/admin/breaks', '/admin/report/1']
+    client = login('admin', 'admin123')
+    
+    with counted_statements(None) as primary, counted_statements('replica') as replica:
+        for url in urls:
+            client.get(url)
+    routed_primary, routed_replica = primary['statements'], replica['statements']
+    
+    with app.app_context():
+        monkeypatch.delitem(db.engines, 'replica')
+    with counted_statements(None) as primary:
+        for url in urls:
+            client.get(url)
+    
+    # Only the per-request user lookup stays on the primary
+    assert routed_primary == len(urls)
+    assert routed_replica > 0
+    assert primary['statements'] > routed_primary